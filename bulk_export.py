@@ -0,0 +1,205 @@
+import csv
+import os
+import subprocess
+from collections import defaultdict
+from typing import List
+
+# Import our custom modules
+from ontology import *
+from pipeline import get_props
+
+# ==============================================================================
+# BULK EXPORT (cold loads)
+# ==============================================================================
+# For large cold-start runs the transactional MERGE path is orders of
+# magnitude slower than the offline bulk loader. This module writes grounded
+# packages as neo4j-admin import CSVs and shells out to
+# `neo4j-admin database import full`, which bypasses the transaction log.
+# It assumes an EMPTY (stopped) database; incremental updates must keep
+# using the transactional Corroborator path.
+
+def _node_id(label: str, key_value) -> str:
+    """Builds a globally unique :ID for the import id space."""
+    return f"{label}|{key_value}"
+
+def _add_from_source(rels: List[dict], node_id: str, source_id: str, rel_props: dict, meta: ProvenanceModel):
+    # Corroborated nodes also carry a denormalized is_active flag; on a cold
+    # load every imported fact is active (see _tx_corroborate_and_ingest).
+    rels.append({
+        ":START_ID": node_id,
+        ":END_ID": source_id,
+        ":TYPE": "FROM_SOURCE",
+        "retrieved_at:long": meta.retrieved_at,
+        "trust_score:double": meta.trust_score,
+        "is_active:boolean": "true",
+        **rel_props,
+    })
+
+def collect_rows(product_packages: List[ExtractionPackage], branch_packages: List[ExtractionPackage]):
+    """Flattens grounded packages into node and relationship row dicts.
+
+    Mirrors the structure the transactional ingestors create, minus the
+    Corroborator (on an empty database every fact is the winner).
+    """
+    nodes = defaultdict(dict)     # label -> {node_id: props}
+    plain_rels = []               # structural rels without properties
+    seen_rels = set()             # (start, end, type) - the importer has no MERGE
+    source_rels = []              # FROM_SOURCE rels with provenance props
+
+    def add_node(label, key_value, props=None):
+        node_id = _node_id(label, key_value)
+        nodes[label].setdefault(node_id, {}).update(props or {})
+        return node_id
+
+    def add_rel(start_id, end_id, rel_type):
+        # Deduplicated like the nodes: packages referencing the same entity
+        # (e.g. an employee listed by two branch pages) must not produce
+        # duplicate relationship rows in the cold-loaded graph.
+        if (start_id, end_id, rel_type) in seen_rels: return
+        seen_rels.add((start_id, end_id, rel_type))
+        plain_rels.append({":START_ID": start_id, ":END_ID": end_id, ":TYPE": rel_type})
+
+    for package in product_packages:
+        data, meta = package.data, package.metadata
+        if not data.product or not data.product.name: continue
+        source_id = add_node("Source", meta.url, {"url": meta.url})
+        product_name = data.product.name.value
+        node_props, rel_props = get_props(data.product)
+        node_props['name'] = product_name
+        node_props['is_active:boolean'] = 'true'
+        product_id = add_node("Product", product_name, node_props)
+        _add_from_source(source_rels, product_id, source_id, rel_props, meta)
+
+        if data.product_type and data.product_type.name:
+            type_id = add_node("ProductType", data.product_type.name.value, {"name": data.product_type.name.value})
+            add_rel(product_id, type_id, "HAS_PRODUCT_TYPE")
+        if data.risk_class and data.risk_class.risk_class:
+            risk_id = add_node("RiskClass", data.risk_class.risk_class.value, {"risk_class": data.risk_class.risk_class.value})
+            add_rel(product_id, risk_id, "HAS_RISK_CLASS")
+
+        for condition in (data.conditions or []):
+            if condition is None or condition.interest_rate is None: continue
+            key = f"{product_name}_{condition.min_amount}_{condition.term_years}"
+            node_props, rel_props = get_props(condition)
+            node_props['key'] = key
+            node_props['is_active:boolean'] = 'true'
+            condition_id = add_node("Condition", key, node_props)
+            add_rel(product_id, condition_id, "HAS_CONDITION")
+            _add_from_source(source_rels, condition_id, source_id, rel_props, meta)
+
+        for faq in (data.faqs or []):
+            if faq is None or faq.question is None: continue
+            node_props, rel_props = get_props(faq)
+            node_props['question'] = faq.question.value
+            node_props['is_active:boolean'] = 'true'
+            faq_id = add_node("FAQ", faq.question.value, node_props)
+            add_rel(product_id, faq_id, "HAS_FAQ")
+            _add_from_source(source_rels, faq_id, source_id, rel_props, meta)
+
+    for package in branch_packages:
+        data, meta = package.data, package.metadata
+        if not data.branch or not data.branch.name: continue
+        source_id = add_node("Source", meta.url, {"url": meta.url})
+        branch_name = data.branch.name.value
+        node_props, rel_props = get_props(data.branch)
+        node_props['name'] = branch_name
+        node_props['is_active:boolean'] = 'true'
+        branch_id = add_node("Branch", branch_name, node_props)
+        _add_from_source(source_rels, branch_id, source_id, rel_props, meta)
+
+        for employee in (data.branch.employees or []):
+            if employee is None or employee.name is None: continue
+            node_props, rel_props = get_props(employee)
+            node_props['name'] = employee.name.value
+            node_props['is_active:boolean'] = 'true'
+            employee_id = add_node("Employee", employee.name.value, node_props)
+            add_rel(employee_id, branch_id, "WORKS_IN")
+            _add_from_source(source_rels, employee_id, source_id, rel_props, meta)
+            if employee.role_type:
+                role_id = add_node("RoleType", employee.role_type.value, {"name": employee.role_type.value})
+                add_rel(employee_id, role_id, "HAS_ROLE_TYPE")
+
+    return nodes, plain_rels, source_rels
+
+def _typed_key(key: str, values: List) -> str:
+    """Appends the neo4j-admin type suffix matching a property's values.
+
+    Without a suffix the importer loads every column as a string, and the
+    read queries then compare e.g. a string min_amount against an integer
+    parameter, which evaluates to null and silently returns no rows.
+    """
+    if ":" in key:  # already typed explicitly (e.g. is_active:boolean)
+        return key
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return f"{key}:boolean"
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return f"{key}:long"
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return f"{key}:double"
+    return key
+
+def _write_csv(path: str, fieldnames: List[str], rows: List[dict]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def export_packages_to_csv(product_packages, branch_packages, out_dir: str) -> dict:
+    """Writes one node CSV per label plus relationship CSVs into out_dir.
+
+    Returns {"nodes": [paths], "relationships": [paths]} for the importer.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    nodes, plain_rels, source_rels = collect_rows(product_packages, branch_packages)
+
+    node_files = []
+    for label, rows_by_id in nodes.items():
+        prop_keys = sorted({k for props in rows_by_id.values() for k in props})
+        typed_keys = {key: _typed_key(key, [props.get(key) for props in rows_by_id.values()])
+                      for key in prop_keys}
+        rows = [{":ID": node_id, ":LABEL": label,
+                 **{typed_keys[k]: v for k, v in props.items()}}
+                for node_id, props in rows_by_id.items()]
+        path = os.path.join(out_dir, f"{label.lower()}s.csv")
+        _write_csv(path, [":ID", ":LABEL"] + [typed_keys[k] for k in prop_keys], rows)
+        node_files.append(path)
+
+    rel_files = []
+    rels_path = os.path.join(out_dir, "relationships.csv")
+    _write_csv(rels_path, [":START_ID", ":END_ID", ":TYPE"], plain_rels)
+    rel_files.append(rels_path)
+
+    source_keys = sorted({k for row in source_rels for k in row} - {":START_ID", ":END_ID", ":TYPE"})
+    typed_source_keys = {key: _typed_key(key, [row.get(key) for row in source_rels])
+                         for key in source_keys}
+    source_rows = [{k: v for k, v in row.items() if k in (":START_ID", ":END_ID", ":TYPE")} |
+                   {typed_source_keys[k]: v for k, v in row.items() if k in typed_source_keys}
+                   for row in source_rels]
+    sources_path = os.path.join(out_dir, "from_source.csv")
+    _write_csv(sources_path, [":START_ID", ":END_ID", ":TYPE"] + [typed_source_keys[k] for k in source_keys], source_rows)
+    rel_files.append(sources_path)
+
+    print(f"Bulk export: wrote {sum(len(r) for r in nodes.values())} nodes and "
+          f"{len(plain_rels) + len(source_rels)} relationships to {out_dir}.")
+    return {"nodes": node_files, "relationships": rel_files}
+
+def run_bulk_import(csv_files: dict, database: str = "neo4j", overwrite: bool = False):
+    """Shells out to neo4j-admin to bulk-load the exported CSVs.
+
+    The target database must be stopped and empty; neo4j-admin refuses a
+    non-empty one unless overwrite=True is passed explicitly, which
+    destroys the existing graph. neo4j-admin does not create constraints
+    or indexes, so pipeline.ensure_schema() must be run once the database
+    is restarted - without the uniqueness constraints the read queries
+    fall back from unique-index seeks to label scans.
+    """
+    cmd = ["neo4j-admin", "database", "import", "full", database]
+    if overwrite:
+        cmd.append("--overwrite-destination")
+    for path in csv_files["nodes"]:
+        cmd.append(f"--nodes={path}")
+    for path in csv_files["relationships"]:
+        cmd.append(f"--relationships={path}")
+    print(f"Running: {' '.join(cmd)}")
+    subprocess.run(cmd, check=True)
@@ -0,0 +1,35 @@
+import os
+import json
+import hashlib
+from typing import Optional
+
+# Import our custom modules
+import config
+
+def make_key(*parts: str) -> str:
+    """Builds a content-addressable cache key from the given string parts."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+def _path_for(key: str) -> str:
+    return os.path.join(config.CACHE_DIR, f"{key}.json")
+
+def get(key: str) -> Optional[dict]:
+    """Returns the cached payload for a key, or None on a miss."""
+    try:
+        with open(_path_for(key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def set(key: str, value: dict):
+    """Stores a JSON-serializable payload under a key."""
+    os.makedirs(config.CACHE_DIR, exist_ok=True)
+    with open(_path_for(key), "w", encoding="utf-8") as f:
+        json.dump(value, f)
+
+def evict(key: str):
+    """Removes a stale entry, e.g. after a schema-validation failure."""
+    try:
+        os.remove(_path_for(key))
+    except FileNotFoundError:
+        pass
@@ -1,3 +1,4 @@
+import functools
 import os
 from google.colab import userdata
 
@@ -7,6 +8,15 @@ NEO4J_USERNAME = userdata.get('NEO4J_USERNAME')
 NEO4J_PASSWORD = userdata.get('NEO4J_PASSWORD')
 GOOGLE_API_KEY = userdata.get('GOOGLE_API_KEY')
 
+# Naming the database explicitly saves the driver a home-database
+# discovery round trip on every session open (and on reconnects).
+NEO4J_DATABASE = os.environ.get("NEO4J_DATABASE", "neo4j")
+
+# --- LLM Response Cache ---
+# On-disk cache for extraction/grounding calls; identical inputs skip the
+# (paid) Gemini round-trip entirely on re-runs.
+CACHE_DIR = os.environ.get("LLM_CACHE_DIR", ".llm_cache")
+
 # --- Target URLs for webscraping ---
 TARGET_URLS = [
     "https://www.vblh.de/privatkunden/geldanlage/sparbrief.html",
@@ -24,9 +34,13 @@ SOURCE_TRUST_SCORES = {
     "https://intern.vblh.de/": 0.95       
 }
 
+# Precomputed prefixes, longest first, so the most specific domain wins.
+_PREFIXES = tuple(sorted(SOURCE_TRUST_SCORES.items(), key=lambda kv: -len(kv[0])))
+
+@functools.lru_cache(maxsize=256)
 def get_trust_score(url: str) -> float:
     """Findet den passenden Trust Score für eine gegebene URL."""
-    for domain, score in SOURCE_TRUST_SCORES.items():
+    for domain, score in _PREFIXES:
         if url.startswith(domain):
             return score
     return 0.5 # some standard-Score
@@ -1,7 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import config
 from ontology import *
 from pipeline import (
-    get_webpage_content,
+    crawl_all,
     extract_structured_data,
     ground_package,
     ingest_product_package,
@@ -11,59 +14,90 @@ from pipeline import (
     ingest_fake_data
 )
 
-def run_ingestion():
-    """Executes the entire ingestion process."""
-    
+def process_url(url, webpage_text, schema_class, ingest_fn):
+    """Runs extract -> ground -> ingest for one already-fetched page.
+
+    Safe to run from worker threads: the ingest functions open their own
+    session on the shared driver pool.
+    """
+    print("\n" + "="*50 + f"\nProcessing URL: {url}\n" + "="*50)
+    if not webpage_text:
+        return
+
+    # Step 1: LLM extracts the payload
+    llm_data = extract_structured_data(text=webpage_text, schema_class=schema_class)
+    if not llm_data:
+        return
+
+    # Step 2: Create metadata (Provenance & Versioning)
+    provenance = ProvenanceModel(url=url, trust_score=config.get_trust_score(url))
+
+    # Step 3: Bundle the extraction package
+    package = ExtractionPackage[schema_class](metadata=provenance, data=llm_data)
+
+    # --- STEP 3.5: GROUNDING ---
+    grounded_package = ground_package(package)
+
+    # Step 4: Pass the package to the Corroborator/Ingestor
+    ingest_fn(grounded_package) # Pass the FILTERED package
+
+def run_ingestion(bulk: bool = False):
+    """Executes the entire ingestion process.
+
+    With bulk=True the grounded packages are buffered and handed to the
+    offline neo4j-admin bulk importer (see bulk_export.py) instead of the
+    transactional Corroborator path - only valid for cold loads against a
+    stopped, empty database.
+    """
+
+    if bulk:
+        import bulk_export
+        product_packages, branch_packages = [], []
+
+        print("\n" + "="*50 + "\nBULK MODE: BUFFERING PACKAGES FOR OFFLINE IMPORT\n" + "="*50)
+        page_texts = asyncio.run(crawl_all(config.TARGET_URLS + config.FILIAL_URLS))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(process_url, url, page_texts.get(url), KnowledgeGraphData, product_packages.append)
+                       for url in config.TARGET_URLS]
+            futures += [executor.submit(process_url, url, page_texts.get(url), BranchData, branch_packages.append)
+                        for url in config.FILIAL_URLS]
+            # Re-raise worker exceptions; a silently failed extraction must
+            # not feed empty CSVs to the offline importer.
+            for future in futures: future.result()
+
+        csv_files = bulk_export.export_packages_to_csv(product_packages, branch_packages, out_dir="bulk_csv")
+        bulk_export.run_bulk_import(csv_files)
+        print("Bulk import done. Fake-data injection and inference were skipped; "
+              "run ensure_schema() and then those steps against the restarted database.")
+        return
+
     # --- PHASE 0: SETUP ---
     clear_database()
 
     # --- PHASE 1: REAL DATA INGESTION ---
     print("\n" + "="*50 + "\nPHASE 1: STARTING REAL DATA INGESTION\n" + "="*50)
 
-    # 1a. Process Product URLs
-    for url in config.TARGET_URLS:
-        print("\n" + "="*50 + f"\nProcessing PRODUCT URL: {url}\n" + "="*50)
-        webpage_text = get_webpage_content(url)
-        if webpage_text:
-            # Step 1: LLM extracts the payload
-            llm_data = extract_structured_data(text=webpage_text, schema_class=KnowledgeGraphData)
-            
-            if llm_data:
-                # Step 2: Create metadata (Provenance & Versioning)
-                provenance = ProvenanceModel(url=url, trust_score=config.get_trust_score(url))
-                
-                # Step 3: Bundle the extraction package
-                package = ExtractionPackage[KnowledgeGraphData](metadata=provenance, data=llm_data)
-                
-                # --- STEP 3.5: GROUNDING ---
-                grounded_package = ground_package(package)
-                
-                # Step 4: Pass the package to the Corroborator/Ingestor
-                ingest_product_package(grounded_package) # Pass the FILTERED package
+    # Fetch all pages concurrently up front; the workers below only do
+    # LLM extraction and graph ingestion.
+    page_texts = asyncio.run(crawl_all(config.TARGET_URLS + config.FILIAL_URLS))
+
+    # 1a. Process Product URLs in parallel (extraction/grounding/ingestion
+    # are all I/O-bound, so the per-URL pipelines overlap).
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(process_url, url, page_texts.get(url), KnowledgeGraphData, ingest_product_package)
+                   for url in config.TARGET_URLS]
+        # Re-raise worker exceptions, as the sequential loop this replaced
+        # did - a failed ingest must not look like a successful run.
+        for future in futures: future.result()
 
     # --- PHASE 1.5: FAKE DATA INJECTION (for Corroborator test) ---
     ingest_fake_data()
 
-    # 1b. Process Branch URLs
-    for url in config.FILIAL_URLS:
-        print("\n" + "="*50 + f"\nProcessing BRANCH URL: {url}\n" + "="*50)
-        webpage_text = get_webpage_content(url)
-        if webpage_text:
-            # Step 1: LLM extracts the payload
-            llm_branch_data = extract_structured_data(text=webpage_text, schema_class=BranchData)
-            
-            if llm_branch_data:
-                # Step 2: Create metadata
-                provenance = ProvenanceModel(url=url, trust_score=config.get_trust_score(url))
-                
-                # Step 3: Bundle the package
-                package = ExtractionPackage[BranchData](metadata=provenance, data=llm_branch_data)
-                
-                # --- STEP 3.5: GROUNDING ---
-                grounded_package = ground_package(package)
-                
-                # Step 4: Pass the package to the Corroborator/Ingestor
-                ingest_branch_package(grounded_package) # Pass the FILTERED package
+    # 1b. Process Branch URLs in parallel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(process_url, url, page_texts.get(url), BranchData, ingest_branch_package)
+                   for url in config.FILIAL_URLS]
+        for future in futures: future.result()
 
     # --- PHASE 2: INFERENCE ---
     create_inferred_relationships()
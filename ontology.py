@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, TypeVar, Generic
 import enum
+import time
 from datetime import datetime
 
 # --- Enums ---
@@ -39,9 +40,15 @@ class ProvenanceModel(BaseModel):
     of a single extraction.
     """
     url: str
-    retrieved_at: datetime = Field(default_factory=datetime.now)
+    # Epoch milliseconds: cheap to serialize over Bolt, compares as a plain
+    # integer inside Cypher and avoids timezone ambiguity.
+    retrieved_at: int = Field(default_factory=lambda: int(time.time() * 1000))
     trust_score: float
 
+    @property
+    def retrieved_at_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.retrieved_at / 1000)
+
 T = TypeVar('T', bound=BaseModel)
 class ExtractionPackage(BaseModel, Generic[T]):
     """
@@ -56,6 +63,15 @@ class GrounderResponse(BaseModel):
     """The schema for the Grounder's simple boolean response."""
     is_grounded: bool
 
+class GroundingBatchItem(BaseModel):
+    """The Grounder's verdict for one item of a batched grounding call."""
+    id: int
+    is_grounded: bool
+
+class GroundingBatchResponse(BaseModel):
+    """The schema for the Grounder's response when checking many facts at once."""
+    results: List[GroundingBatchItem]
+
 # --- Data Models (Ontology) ---
 class EmployeeModel(BaseModel):
     """Describes a single employee."""
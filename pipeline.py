@@ -1,77 +1,241 @@
+import re
 import requests
+import asyncio
+import aiohttp
 from bs4 import BeautifulSoup
 from google import genai
 import json
 from neo4j import GraphDatabase, Session, Transaction
-from typing import Optional, List, Type
+from typing import Optional, List, NamedTuple, Type, Union, get_args, get_origin
+import atexit
 import enum
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
 # Import our custom modules
+import cache
 import config
 from ontology import *
 
 # --- Client Initialization ---
 client = genai.Client(api_key=config.GOOGLE_API_KEY)
 
+# Single shared Neo4j driver: the Bolt handshake and auth are paid once at
+# import time, and all sessions draw from the same connection pool.
+_driver = GraphDatabase.driver(
+    config.NEO4J_URI,
+    auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD),
+    max_connection_pool_size=32,
+    connection_acquisition_timeout=60,
+)
+atexit.register(_driver.close)
+
+# Bump whenever the extraction/grounding prompts change, so stale cache
+# entries from older prompt wordings are not reused.
+PROMPT_VERSION = "1"
+
 # ==============================================================================
 # 4.1 CRAWLER
 # ==============================================================================
+_WS_RE = re.compile(r'\s+')
+
+# Bound the download per page so a misconfigured/huge page cannot blow up
+# memory; fail fast on slow hosts via connect/read timeouts.
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+_FETCH_TIMEOUT = aiohttp.ClientTimeout(connect=5, total=30)
+
+# Shared session for the synchronous fallback, so TCP+TLS is reused.
+_http = requests.Session()
+
+def _parse_html(html: str) -> str:
+    """Strips scripts/styles from raw HTML and returns the cleaned visible text."""
+    # lxml parses in C (libxml2) and is considerably faster than html.parser.
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup.select('script,style'): tag.decompose()
+    return _WS_RE.sub(' ', soup.get_text(' ')).strip()
+
 def get_webpage_content(url: str) -> Optional[str]:
-    """Fetches the visible text from a webpage."""
+    """Fetches the visible text from a single webpage (synchronous fallback)."""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        for script in soup(["script", "style"]): script.extract()
-        text = soup.get_text(separator=" ")
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        with _http.get(url, stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            for chunk in response.iter_content(65536):
+                buf.extend(chunk)
+                if len(buf) > _MAX_PAGE_BYTES:
+                    print(f"WARNING: {url} exceeds {_MAX_PAGE_BYTES} bytes, truncating.")
+                    break
+        return _parse_html(bytes(buf).decode(response.encoding or 'utf-8', errors='replace'))
     except requests.exceptions.RequestException as e:
         print(f"Error fetching webpage {url}: {e}")
         return None
 
+async def fetch(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+    """Fetches the raw HTML of a single webpage on the shared aiohttp session."""
+    try:
+        async with session.get(url, timeout=_FETCH_TIMEOUT) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                buf.extend(chunk)
+                if len(buf) > _MAX_PAGE_BYTES:
+                    print(f"WARNING: {url} exceeds {_MAX_PAGE_BYTES} bytes, truncating.")
+                    break
+            return bytes(buf).decode(response.charset or 'utf-8', errors='replace')
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching webpage {url}: {e}")
+        return None
+
+async def crawl_all(urls: List[str]) -> dict:
+    """
+    Fetches all URLs concurrently and returns a {url: visible_text} dict.
+    Network round-trips overlap via asyncio.gather, so total fetch time is
+    roughly the slowest page instead of the sum of all pages.
+    """
+    loop = asyncio.get_running_loop()
+    connector = aiohttp.TCPConnector(limit=16)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        raw_pages = await asyncio.gather(*(fetch(session, url) for url in urls))
+    # HTML parsing is CPU-bound, so run it off the event loop.
+    texts = []
+    for raw in raw_pages:
+        if raw is None:
+            texts.append(None)
+        else:
+            texts.append(await loop.run_in_executor(None, _parse_html, raw))
+    return dict(zip(urls, texts))
+
 # ==============================================================================
 # 4.2 EXTRACTOR
 # ==============================================================================
-def extract_structured_data(text: str, schema_class: Type[BaseModel]) -> Optional[BaseModel]:
-    """Extracts knowledge from text using the Gemini API."""
-    prompt = f"""
-    Extract all relevant information from the following text and populate the provided data schema.
-    IMPORTANT: The schema requires a `ProvableFact` object for many facts. 
+_EXTRACTION_INSTRUCTIONS = """
+    Extract all relevant information from the provided source text and populate the provided data schema.
+    IMPORTANT: The schema requires a `ProvableFact` object for many facts.
     You must fill the `value` field (the fact) AND the `evidence` field (the text snippet from the source text
     that proves the fact).
-    
+    """
+
+# Gemini context-cache handles keyed by page-text hash, so the expensive
+# prefill of a page is computed and billed once even when two different
+# schemas (KnowledgeGraphData and BranchData) are extracted from it.
+_context_caches = {}
+_context_caches_lock = threading.Lock()
+
+def _get_context_cache(text: str):
+    key = cache.make_key(text)
+    with _context_caches_lock:
+        handle = _context_caches.get(key)
+    if handle is None:
+        # Created outside the lock so extraction workers are not serialized
+        # behind the network call; a rare duplicate create is harmless.
+        handle = client.caches.create(
+            model="gemini-2.5-pro",
+            config={"contents": [text], "ttl": "3600s"},
+        )
+        with _context_caches_lock:
+            handle = _context_caches.setdefault(key, handle)
+    return handle
+
+def _evict_context_cache(text: str):
+    """Drops a cached handle, e.g. after the server reports it expired."""
+    with _context_caches_lock:
+        _context_caches.pop(cache.make_key(text), None)
+
+def extract_structured_data(text: str, schema_class: Type[BaseModel]) -> Optional[BaseModel]:
+    """Extracts knowledge from text using the Gemini API.
+
+    Results are cached on disk keyed by model, prompt version, schema and
+    input text, so byte-identical re-runs skip the LLM call entirely.
+    The page text itself goes through Gemini's context cache, so its
+    prefill is shared across schemas and retries.
+    """
+    cache_key = cache.make_key("gemini-2.5-pro", PROMPT_VERSION, schema_class.__name__, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        try:
+            result = schema_class.model_validate(cached)
+            print(f"Cache hit for schema '{schema_class.__name__}', skipping extraction call.")
+            return result
+        except Exception:
+            cache.evict(cache_key)  # stale entry, fall through to the LLM
+
+    gen_config = {
+        "response_mime_type": "application/json",
+        "response_schema": schema_class,
+    }
+    inline_prompt = f"""{_EXTRACTION_INSTRUCTIONS}
     **Text to Analyze:**
     ---
     {text}
     ---
     """
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-pro",
-            contents=prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": schema_class,
-            }
-        )
-        if response.parsed is None:
-            print("ERROR: The SDK could not parse the response into the Pydantic schema.")
-            return None
-        print(f"Model response for schema '{schema_class.__name__}' parsed successfully.")
-        return response.parsed
+        context_cache = _get_context_cache(text)
+        gen_config["cached_content"] = context_cache.name
+        prompt = _EXTRACTION_INSTRUCTIONS
     except Exception as e:
-        print(f"An unexpected ERROR occurred during extraction: {e}")
-        return None
+        # e.g. page below the minimum cacheable token count - send it inline.
+        print(f"Context cache unavailable ({e}), sending page text inline.")
+        prompt = inline_prompt
+    # Bounded retry: a malformed response is fed back to the model instead
+    # of dropping the package (and wasting the whole fetch+scrape upstream).
+    for attempt in range(3):
+        try:
+            response = client.models.generate_content(
+                model="gemini-2.5-pro",
+                contents=prompt,
+                config=gen_config
+            )
+        except Exception as e:
+            if "cached_content" in gen_config:
+                # Most likely an expired handle (the server caches for an
+                # hour, our dict forever): evict it and retry with the page
+                # text inline instead of dropping the package for good.
+                print(f"Extraction with cached context failed ({e}); retrying with inline text.")
+                _evict_context_cache(text)
+                del gen_config["cached_content"]
+                prompt = inline_prompt
+                continue
+            print(f"An unexpected ERROR occurred during extraction: {e}")
+            return None
+        if response.parsed is not None:
+            print(f"Model response for schema '{schema_class.__name__}' parsed successfully.")
+            cache.set(cache_key, response.parsed.model_dump(mode="json"))
+            return response.parsed
+
+        print(f"ERROR: The SDK could not parse the response into the Pydantic schema (attempt {attempt + 1}/3).")
+        feedback = "the output could not be parsed as the requested schema"
+        try:
+            result = schema_class.model_validate_json(response.text)
+        except Exception as e:
+            feedback = str(e)
+        else:
+            # The SDK failed to parse but the raw text validates fine -
+            # salvage it instead of re-prompting for what is already in hand.
+            print(f"Model response for schema '{schema_class.__name__}' salvaged via manual validation.")
+            cache.set(cache_key, result.model_dump(mode="json"))
+            return result
+        prompt += f"\nYour previous output had this error: {feedback}. Fix it and return ONLY valid JSON matching the schema."
+        time.sleep(1.0 * (attempt + 1))
+    return None
 
 # ==============================================================================
 # 4.3 GROUNDER
 # ==============================================================================
 def is_fact_grounded(fact: str, evidence: str) -> bool:
-    """Checks with a 'lightweight' LLM if a fact is supported by an evidence snippet."""
+    """Checks with a 'lightweight' LLM if a fact is supported by an evidence snippet.
+
+    Verdicts are cached on disk keyed by the (fact, evidence) pair.
+    """
+    cache_key = cache.make_key("gemini-2.5-flash-lite", PROMPT_VERSION, fact, evidence)
+    cached = cache.get(cache_key)
+    if cached is not None and isinstance(cached.get("is_grounded"), bool):
+        return cached["is_grounded"]
+
     prompt = f"""
     Verify if the following fact can be inferred from the provided text snippet.
     The fact must be explicitly mentioned or directly logically derivable.
@@ -92,6 +256,7 @@ def is_fact_grounded(fact: str, evidence: str) -> bool:
             }
         )
         if response.parsed:
+            cache.set(cache_key, {"is_grounded": response.parsed.is_grounded})
             return response.parsed.is_grounded
         else:
             print(f"GROUNDER WARNING: Could not parse response. Defaulting to 'False'.")
@@ -100,125 +265,304 @@ def is_fact_grounded(fact: str, evidence: str) -> bool:
         print(f"GROUNDER ERROR: {e}. Defaulting to 'False'.")
         return False
 
-def _ground_model_recursive(model_instance: BaseModel):
-    """Recursively iterates through a Pydantic model and nullifies any ungrounded facts."""
-    if model_instance is None: return
-    
-    # Use .model_fields for Pydantic v2+
-    for field_name, field_obj in model_instance.model_fields.items():
-        field_value = getattr(model_instance, field_name)
-        if field_value is None: continue
-
-        if isinstance(field_value, ProvableFact):
-            if not field_value.value or not field_value.evidence:
-                print(f"--- ⚠️ GROUNDING SKIPPED: Empty value/evidence for {field_name}. Removing.")
-                setattr(model_instance, field_name, None)
-                continue
-            
-            is_grounded = is_fact_grounded(field_value.value, field_value.evidence)
-            if not is_grounded:
-                print(f"--- ❌ GROUNDING FAILED: Fact '{field_value.value}' (for field '{field_name}') will be removed.")
-                setattr(model_instance, field_name, None)
-            else:
-                print(f"--- ✅ GROUNDING PASSED: Fact '{field_value.value}' (for field '{field_name}')")
-        
-        elif isinstance(field_value, BaseModel):
-            _ground_model_recursive(field_value)
-        elif isinstance(field_value, list):
-            for item in field_value:
-                if isinstance(item, BaseModel):
-                    _ground_model_recursive(item)
-                            
+def _classify_annotation(annotation) -> str:
+    """Maps a field annotation to the dispatch kind used by the hot loops."""
+    origin = get_origin(annotation)
+    if origin is Union:  # Optional[X] and friends
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _classify_annotation(args[0]) if len(args) == 1 else "scalar"
+    if origin is list:
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return "list_submodel"
+        return "scalar"
+    if isinstance(annotation, type):
+        if issubclass(annotation, ProvableFact): return "fact"
+        if issubclass(annotation, enum.Enum): return "enum"
+        if issubclass(annotation, BaseModel): return "submodel"
+    return "scalar"
+
+@lru_cache(maxsize=None)
+def _field_spec(cls: Type[BaseModel]) -> tuple:
+    """Returns ((field_name, kind), ...) for a model class, computed once.
+
+    The grounding and ingestion loops walk models thousands of times per
+    run; dispatching on this precomputed table replaces the repeated
+    model_fields lookups and isinstance chains.
+    """
+    return tuple((field_name, _classify_annotation(field_info.annotation))
+                 for field_name, field_info in cls.model_fields.items())
+
+class FactRef(NamedTuple):
+    """Points at a single ProvableFact inside a Pydantic model tree."""
+    parent: BaseModel
+    field_name: str
+    fact: ProvableFact
+
+def _collect_facts(model_instance: BaseModel) -> List[FactRef]:
+    """Collects all ProvableFact instances of a Pydantic model tree.
+
+    Uses an explicit stack instead of recursion, so deep ontologies neither
+    pay a Python frame per submodel nor risk the recursion limit. Facts
+    with an empty value/evidence are nullified right away instead of being
+    collected, since the Grounder has nothing to verify for them.
+    """
+    refs = []
+    if model_instance is None: return refs
+
+    stack = deque([model_instance])
+    while stack:
+        model = stack.pop()
+        for field_name, kind in _field_spec(type(model)):
+            field_value = getattr(model, field_name)
+            if field_value is None: continue
+
+            if kind == "fact":
+                if not field_value.value or not field_value.evidence:
+                    print(f"--- ⚠️ GROUNDING SKIPPED: Empty value/evidence for {field_name}. Removing.")
+                    setattr(model, field_name, None)
+                    continue
+                refs.append(FactRef(model, field_name, field_value))
+
+            elif kind == "submodel":
+                stack.append(field_value)
+            elif kind == "list_submodel":
+                stack.extend(item for item in field_value if item is not None)
+    return refs
+
+def ground_facts_batch(refs: List[FactRef]) -> List[bool]:
+    """Checks all facts of a package with a single batched Grounder call.
+
+    Each (fact, evidence) pair is resolved against the on-disk verdict
+    cache first and only the misses go into the batch prompt; returned
+    verdicts are written back, so byte-identical re-runs skip the call
+    entirely. The shared instructions are sent once instead of per fact;
+    on a parse failure the per-fact (cached, concurrent) path is used as
+    fallback.
+    """
+    results = [None] * len(refs)
+    cache_keys = [cache.make_key("gemini-2.5-flash-lite", PROMPT_VERSION, ref.fact.value, ref.fact.evidence)
+                  for ref in refs]
+    misses = []
+    for i, cache_key in enumerate(cache_keys):
+        cached = cache.get(cache_key)
+        if cached is not None and isinstance(cached.get("is_grounded"), bool):
+            results[i] = cached["is_grounded"]
+        else:
+            misses.append(i)
+    if not misses:
+        print(f"GROUNDER: All {len(refs)} verdicts served from cache, skipping batch call.")
+        return results
+
+    items = [{"id": i, "fact": refs[i].fact.value, "evidence": refs[i].fact.evidence} for i in misses]
+    prompt = f"""
+    For each item below, verify if the fact can be inferred from its evidence snippet.
+    The fact must be explicitly mentioned or directly logically derivable.
+    Return one result per item, carrying over the item's `id` unchanged.
+
+    **Items to verify:**
+    ---
+    {json.dumps(items, ensure_ascii=False, indent=2)}
+    ---
+    """
+    try:
+        response = client.models.generate_content(
+            model="gemini-2.5-flash-lite",
+            contents=prompt,
+            config={
+                "response_mime_type": "application/json",
+                "response_schema": GroundingBatchResponse,
+            }
+        )
+        if response.parsed and len(response.parsed.results) == len(misses):
+            verdicts = {item.id: item.is_grounded for item in response.parsed.results}
+            if set(verdicts) == set(misses):
+                for i in misses:
+                    results[i] = verdicts[i]
+                    cache.set(cache_keys[i], {"is_grounded": verdicts[i]})
+                return results
+        print("GROUNDER WARNING: Batch response incomplete. Falling back to per-fact checks.")
+    except Exception as e:
+        print(f"GROUNDER ERROR in batch call: {e}. Falling back to per-fact checks.")
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        fallback = list(executor.map(
+            lambda i: is_fact_grounded(refs[i].fact.value, refs[i].fact.evidence), misses))
+    for i, verdict in zip(misses, fallback):
+        results[i] = verdict
+    return results
+
 def ground_package(package: ExtractionPackage) -> ExtractionPackage:
-    """Takes an ExtractionPackage and validates all ProvableFact instances within it."""
+    """Takes an ExtractionPackage and validates all ProvableFact instances within it.
+
+    All facts of a package are checked with one batched Grounder call, so
+    the latency is roughly one round-trip instead of one per fact.
+    """
     print("\n" + "="*30 + f"\n🔬 STARTING GROUNDING PROCESS for {package.metadata.url}\n" + "="*30)
-    _ground_model_recursive(package.data)
+    refs = _collect_facts(package.data)
+    if refs:
+        results = ground_facts_batch(refs)
+        for ref, is_grounded in zip(refs, results):
+            if not is_grounded:
+                print(f"--- ❌ GROUNDING FAILED: Fact '{ref.fact.value}' (for field '{ref.field_name}') will be removed.")
+                setattr(ref.parent, ref.field_name, None)
+            else:
+                print(f"--- ✅ GROUNDING PASSED: Fact '{ref.fact.value}' (for field '{ref.field_name}')")
     print(f"🔬 GROUNDING PROCESS for {package.metadata.url} COMPLETED.")
     return package
 
 # ==============================================================================
 # 4.4 INGESTOR & CORROBORATOR
 # ==============================================================================
-def get_node_props(model: BaseModel) -> dict:
-    """Converts a Pydantic model into a flat dictionary of VALUES for Neo4j node properties."""
-    props = {}
-    if model is None: return props
-    # Use .model_fields.items() for Pydantic v2+
-    for field_name, field_info in model.model_fields.items():
-        field_value = getattr(model, field_name)
-        if isinstance(field_value, ProvableFact):
-            if field_value.value is not None: props[field_name] = field_value.value
-        elif isinstance(field_value, enum.Enum):
-             props[field_name] = field_value.value
-        elif isinstance(field_value, (str, int, float, bool)) or field_value is None:
-            props[field_name] = field_value
-    return props
-
-def get_rel_props(model: BaseModel) -> dict:
-    """Converts a Pydantic model into a flat dictionary of EVIDENCE snippets for Neo4j relationship properties."""
-    props = {}
-    if model is None: return props
-    for field_name, field_info in model.model_fields.items():
+def get_props(model: BaseModel) -> tuple:
+    """Converts a Pydantic model into two flat dictionaries in a single pass:
+    the VALUES for Neo4j node properties and the EVIDENCE snippets for
+    relationship properties."""
+    node_props, rel_props = {}, {}
+    if model is None: return node_props, rel_props
+    for field_name, kind in _field_spec(type(model)):
         field_value = getattr(model, field_name)
-        if isinstance(field_value, ProvableFact):
-            if field_value.evidence is not None: props[f"{field_name}_evidence"] = field_value.evidence
-    return props
+        if field_value is None:
+            node_props[field_name] = None
+        elif kind == "fact":
+            if field_value.value is not None: node_props[field_name] = field_value.value
+            if field_value.evidence is not None: rel_props[f"{field_name}_evidence"] = field_value.evidence
+        elif kind == "enum":
+            node_props[field_name] = field_value.value
+        elif kind == "scalar":
+            node_props[field_name] = field_value
+    return node_props, rel_props
+
+# Labels and key properties cannot be Cypher parameters, so the Corroborator
+# only interpolates pairs from this whitelist into its query text.
+CORROBORATOR_TARGETS = {
+    ("Product", "name"),
+    ("Condition", "key"),
+    ("FAQ", "question"),
+    ("Branch", "name"),
+    ("Employee", "name"),
+}
+
+# One round-trip that finds the competing active fact, decides the winner
+# (newer timestamp wins, ties go to the higher trust score), applies the new
+# properties and deactivates the loser atomically.
+_CORROBORATE_QUERY_TEMPLATE = """
+MERGE (q:Source {{url: $url}})
+MERGE (n:{label} {{{key}: $key_value}})
+WITH n, q
+OPTIONAL MATCH (n)-[r_old:FROM_SOURCE {{is_active: true}}]->(q_old:Source)
+WHERE q_old.url <> $url
+WITH n, q, r_old,
+     (r_old IS NULL
+      OR $retrieved_at > r_old.retrieved_at
+      OR ($retrieved_at = r_old.retrieved_at AND $trust_score >= r_old.trust_score)) AS wins
+FOREACH (_ IN CASE WHEN wins THEN [1] ELSE [] END | SET n += $node_props)
+FOREACH (r IN CASE WHEN wins AND r_old IS NOT NULL THEN [r_old] ELSE [] END | SET r.is_active = false)
+MERGE (n)-[r_new:FROM_SOURCE]->(q)
+SET r_new += $rel_props, r_new.is_active = wins, n.is_active = true
+RETURN wins
+"""
+
+# Batch variant of the fused Corroborator: one UNWIND round-trip processes a
+# whole list of facts from the same source/package server-side.
+_CORROBORATE_BATCH_QUERY_TEMPLATE = """
+MERGE (q:Source {{url: $url}})
+WITH q
+UNWIND $rows AS row
+MERGE (n:{label} {{{key}: row.key_value}})
+WITH n, q, row
+OPTIONAL MATCH (n)-[r_old:FROM_SOURCE {{is_active: true}}]->(q_old:Source)
+WHERE q_old.url <> $url
+WITH n, q, row, r_old,
+     (r_old IS NULL
+      OR $retrieved_at > r_old.retrieved_at
+      OR ($retrieved_at = r_old.retrieved_at AND $trust_score >= r_old.trust_score)) AS wins
+FOREACH (_ IN CASE WHEN wins THEN [1] ELSE [] END | SET n += row.node_props)
+FOREACH (r IN CASE WHEN wins AND r_old IS NOT NULL THEN [r_old] ELSE [] END | SET r.is_active = false)
+MERGE (n)-[r_new:FROM_SOURCE]->(q)
+SET r_new += row.rel_props,
+    r_new.retrieved_at = $retrieved_at,
+    r_new.trust_score = $trust_score,
+    r_new.is_active = wins,
+    n.is_active = true
+RETURN row.key_value AS key_value, wins
+"""
+
+# Formatted once at import: the driver and the server-side query cache both
+# key on the literal query text, and per-call string building disappears.
+_CORROBORATE_QUERIES = {
+    target: _CORROBORATE_QUERY_TEMPLATE.format(label=target[0], key=target[1])
+    for target in CORROBORATOR_TARGETS
+}
+_CORROBORATE_BATCH_QUERIES = {
+    target: _CORROBORATE_BATCH_QUERY_TEMPLATE.format(label=target[0], key=target[1])
+    for target in CORROBORATOR_TARGETS
+}
+
+def _tx_corroborate_and_ingest_batch(
+    tx: Transaction,
+    node_label: str,
+    node_key: str,
+    rows: List[dict],
+    meta: ProvenanceModel
+):
+    """Corroborates and ingests a whole list of facts in one UNWIND round-trip.
+
+    Each row is a dict with 'key_value', 'node_props' and 'rel_props'.
+    """
+    query = _CORROBORATE_BATCH_QUERIES.get((node_label, node_key))
+    if query is None:
+        raise ValueError(f"Refusing to corroborate unknown label/key pair: {node_label}.{node_key}")
+    if not rows: return
+
+    result = tx.run(
+        query,
+        rows=rows,
+        url=meta.url,
+        retrieved_at=meta.retrieved_at,
+        trust_score=meta.trust_score,
+    )
+    verdicts = {}
+    for record in result:
+        key_value = record['key_value']
+        verdicts[key_value] = verdicts.get(key_value, True) and record['wins']
+    for key_value, wins in verdicts.items():
+        if wins:
+            print(f"--- 🏆 CORROBORATOR: NEW wins for {key_value}")
+        else:
+            print(f"--- 🛡️ CORROBORATOR: OLD wins for {key_value}")
 
 def _tx_corroborate_and_ingest(
-    tx: Transaction, 
-    node_label: str, 
-    node_key: str, 
-    node_key_value: str, 
-    new_node_props: dict, 
+    tx: Transaction,
+    node_label: str,
+    node_key: str,
+    node_key_value: str,
+    new_node_props: dict,
     new_rel_props: dict,
     meta: ProvenanceModel
 ):
-    """Executes the Corroborator logic (Model B) in a single transaction."""
-    
+    """Executes the Corroborator logic (Model B) in a single Bolt round-trip."""
+    query = _CORROBORATE_QUERIES.get((node_label, node_key))
+    if query is None:
+        raise ValueError(f"Refusing to corroborate unknown label/key pair: {node_label}.{node_key}")
+
     new_rel_props['retrieved_at'] = meta.retrieved_at
     new_rel_props['trust_score'] = meta.trust_score
 
-    query_find_old = f"""
-    MATCH (n:{node_label} {{{node_key}: $key_value}})-[r_alt:FROM_SOURCE {{is_active: true}}]->(q_alt:Source)
-    WHERE q_alt.url <> $url
-    RETURN r_alt.retrieved_at AS old_ts, r_alt.trust_score AS old_trust
-    """
-    result = tx.run(query_find_old, key_value=node_key_value, url=meta.url)
-    old_fact = result.single()
-
-    is_candidate_winner = False
-    if not old_fact:
-        is_candidate_winner = True 
-    else:
-        if meta.retrieved_at > old_fact['old_ts']: is_candidate_winner = True
-        elif meta.retrieved_at == old_fact['old_ts']:
-            if meta.trust_score >= old_fact['old_trust']: is_candidate_winner = True
-            else: is_candidate_winner = False
-        else: is_candidate_winner = False
-
-    tx.run(f"MERGE (q:Source {{url: $url}}) MERGE (n:{node_label} {{{node_key}: $key_value}})", 
-           url=meta.url, key_value=node_key_value)
-    
-    if is_candidate_winner:
+    result = tx.run(
+        query,
+        key_value=node_key_value,
+        url=meta.url,
+        retrieved_at=meta.retrieved_at,
+        trust_score=meta.trust_score,
+        node_props=new_node_props,
+        rel_props=new_rel_props,
+    )
+    wins_per_old_fact = [record['wins'] for record in result]
+    if all(wins_per_old_fact):
         print(f"--- 🏆 CORROBORATOR: NEW wins for {node_key_value}")
-        tx.run(f"""
-        MATCH (n:{node_label} {{{node_key}: $key_value}})
-        OPTIONAL MATCH (n)-[r_alt:FROM_SOURCE {{is_active: true}}]->()
-        SET n = $node_props, r_alt.is_active = false
-        """, key_value=node_key_value, node_props=new_node_props)
-        
-        new_rel_props['is_active'] = True
-        tx.run(f"""
-        MATCH (n:{node_label} {{{node_key}: $key_value}}) MATCH (q:Source {{url: $url}})
-        MERGE (n)-[r_new:FROM_SOURCE]->(q) SET r_new = $rel_props
-        """, key_value=node_key_value, url=meta.url, rel_props=new_rel_props)
     else:
         print(f"--- 🛡️ CORROBORATOR: OLD wins for {node_key_value}")
-        new_rel_props['is_active'] = False
-        tx.run(f"""
-        MATCH (n:{node_label} {{{node_key}: $key_value}}) MATCH (q:Source {{url: $url}})
-        MERGE (n)-[r_new:FROM_SOURCE]->(q) SET r_new = $rel_props
-        """, key_value=node_key_value, url=meta.url, rel_props=new_rel_props)
 
 def _tx_ingest_product_package(tx: Transaction, package: ExtractionPackage[KnowledgeGraphData]):
     """Executes the entire product ingestion in a single transaction."""
@@ -226,14 +570,19 @@ def _tx_ingest_product_package(tx: Transaction, package: ExtractionPackage[Knowl
     meta = package.metadata
     
     print(f"--- ⏳ STALENESS-CHECK: Deactivating old Product-facts from {meta.url}...")
-    tx.run("MATCH (n:Product|Condition|FAQ)-[r:FROM_SOURCE {is_active: true}]->(q:Source {url: $url}) SET r.is_active = false", url=meta.url)
+    tx.run("""
+    MATCH (n:Product|Condition|FAQ)-[r:FROM_SOURCE {is_active: true}]->(q:Source {url: $url})
+    SET r.is_active = false
+    WITH DISTINCT n
+    SET n.is_active = EXISTS { (n)-[:FROM_SOURCE {is_active: true}]->() }
+    """, url=meta.url)
     
     if not data.product or not data.product.name: return 
     product_name = data.product.name.value
     print(f"Processing Product: {product_name} from {meta.url}")
-    product_node_props = get_node_props(data.product)
+    product_node_props, product_rel_props = get_props(data.product)
     product_node_props['name'] = product_name
-    _tx_corroborate_and_ingest(tx, "Product", "name", product_name, product_node_props, get_rel_props(data.product), meta)
+    _tx_corroborate_and_ingest(tx, "Product", "name", product_name, product_node_props, product_rel_props, meta)
 
     if data.product_type and data.product_type.name:
         type_name = data.product_type.name.value
@@ -244,22 +593,36 @@ def _tx_ingest_product_package(tx: Transaction, package: ExtractionPackage[Knowl
         tx.run("MATCH (p:Product {name: $p_name}) MERGE (s:RiskClass {risk_class: $c_value}) MERGE (p)-[:HAS_RISK_CLASS]->(s)", p_name=product_name, c_value=class_value)
 
     if data.conditions:
+        condition_rows = []
         for condition in data.conditions:
-            if condition is None or condition.interest_rate is None: continue 
+            if condition is None or condition.interest_rate is None: continue
             key = f"{product_name}_{condition.min_amount}_{condition.term_years}"
-            condition_node_props = get_node_props(condition)
+            condition_node_props, condition_rel_props = get_props(condition)
             condition_node_props['key'] = key
-            _tx_corroborate_and_ingest(tx, "Condition", "key", key, condition_node_props, get_rel_props(condition), meta)
-            tx.run("MATCH (p:Product {name: $p_name}), (k:Condition {key: $key}) MERGE (p)-[:HAS_CONDITION]->(k)", p_name=product_name, key=key)
+            condition_rows.append({"key_value": key, "node_props": condition_node_props, "rel_props": condition_rel_props})
+        _tx_corroborate_and_ingest_batch(tx, "Condition", "key", condition_rows, meta)
+        if condition_rows:
+            tx.run("""
+            UNWIND $rows AS row
+            MATCH (p:Product {name: $p_name}) MATCH (k:Condition {key: row.key_value})
+            MERGE (p)-[:HAS_CONDITION]->(k)
+            """, rows=condition_rows, p_name=product_name)
 
     if data.faqs:
+        faq_rows = []
         for faq in data.faqs:
-            if faq is None or faq.question is None: continue 
+            if faq is None or faq.question is None: continue
             question_value = faq.question.value
-            faq_node_props = get_node_props(faq)
+            faq_node_props, faq_rel_props = get_props(faq)
             faq_node_props['question'] = question_value
-            _tx_corroborate_and_ingest(tx, "FAQ", "question", question_value, faq_node_props, get_rel_props(faq), meta)
-            tx.run("MATCH (p:Product {name: $p_name}), (f:FAQ {question: $q_value}) MERGE (p)-[:HAS_FAQ]->(f)", p_name=product_name, q_value=question_value)
+            faq_rows.append({"key_value": question_value, "node_props": faq_node_props, "rel_props": faq_rel_props})
+        _tx_corroborate_and_ingest_batch(tx, "FAQ", "question", faq_rows, meta)
+        if faq_rows:
+            tx.run("""
+            UNWIND $rows AS row
+            MATCH (p:Product {name: $p_name}) MATCH (f:FAQ {question: row.key_value})
+            MERGE (p)-[:HAS_FAQ]->(f)
+            """, rows=faq_rows, p_name=product_name)
 
 def _tx_ingest_branch_package(tx: Transaction, package: ExtractionPackage[BranchData]):
     """Executes the entire branch ingestion in a single transaction."""
@@ -268,39 +631,55 @@ def _tx_ingest_branch_package(tx: Transaction, package: ExtractionPackage[Branch
 
     print(f"--- ⏳ STALENESS-CHECK: Deactivating old Branch-facts from {meta.url}...")
     # KORREKTUR: This is NOT an f-string. Use single curly braces.
-    tx.run("MATCH (n:Branch|Employee)-[r:FROM_SOURCE {is_active: true}]->(q:Source {url: $url}) SET r.is_active = false", url=meta.url)
+    tx.run("""
+    MATCH (n:Branch|Employee)-[r:FROM_SOURCE {is_active: true}]->(q:Source {url: $url})
+    SET r.is_active = false
+    WITH DISTINCT n
+    SET n.is_active = EXISTS { (n)-[:FROM_SOURCE {is_active: true}]->() }
+    """, url=meta.url)
     
     if not data.branch or not data.branch.name: return
     branch_name = data.branch.name.value
     print(f"Processing Branch: {branch_name} from {meta.url}")
-    branch_node_props = get_node_props(data.branch)
+    branch_node_props, branch_rel_props = get_props(data.branch)
     branch_node_props['name'] = branch_name
-    _tx_corroborate_and_ingest(tx, "Branch", "name", branch_name, branch_node_props, get_rel_props(data.branch), meta)
+    _tx_corroborate_and_ingest(tx, "Branch", "name", branch_name, branch_node_props, branch_rel_props, meta)
 
     if data.branch.employees:
+        employee_rows = []
         for employee in data.branch.employees:
-            if employee is None or employee.name is None: continue 
+            if employee is None or employee.name is None: continue
             employee_name = employee.name.value
             print(f"-- Processing Employee: {employee_name}")
-            employee_node_props = get_node_props(employee)
+            employee_node_props, employee_rel_props = get_props(employee)
             employee_node_props['name'] = employee_name
-            _tx_corroborate_and_ingest(tx, "Employee", "name", employee_name, employee_node_props, get_rel_props(employee), meta)
-            tx.run("MATCH (m:Employee {name: $m_name}), (f:Branch {name: $f_name}) MERGE (m)-[:WORKS_IN]->(f)", m_name=employee_name, f_name=branch_name)
-            if employee.role_type:
-                role_type_name = employee.role_type.value
-                tx.run("MATCH (m:Employee {name: $m_name}) MERGE (st:RoleType {name: $r_name}) MERGE (m)-[:HAS_ROLE_TYPE]->(st)", m_name=employee_name, r_name=role_type_name)
+            role_type_name = employee.role_type.value if employee.role_type else None
+            employee_rows.append({
+                "key_value": employee_name,
+                "node_props": employee_node_props,
+                "rel_props": employee_rel_props,
+                "role_type": role_type_name,
+            })
+        _tx_corroborate_and_ingest_batch(tx, "Employee", "name", employee_rows, meta)
+        if employee_rows:
+            tx.run("""
+            UNWIND $rows AS row
+            MATCH (m:Employee {name: row.key_value}) MATCH (f:Branch {name: $f_name})
+            MERGE (m)-[:WORKS_IN]->(f)
+            FOREACH (r_name IN CASE WHEN row.role_type IS NULL THEN [] ELSE [row.role_type] END |
+                MERGE (st:RoleType {name: r_name})
+                MERGE (m)-[:HAS_ROLE_TYPE]->(st))
+            """, rows=employee_rows, f_name=branch_name)
 
 def ingest_product_package(package: ExtractionPackage[KnowledgeGraphData]):
     """Manager function: Writes a product package in a single transaction."""
-    driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-    with driver.session() as session:
+    with _driver.session(database=config.NEO4J_DATABASE) as session:
         session.execute_write(_tx_ingest_product_package, package)
     print(f"Ingestion transaction for Product package completed.")
 
 def ingest_branch_package(package: ExtractionPackage[BranchData]):
     """Manager function: Writes a branch package in a single transaction."""
-    driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-    with driver.session() as session:
+    with _driver.session(database=config.NEO4J_DATABASE) as session:
         session.execute_write(_tx_ingest_branch_package, package)
     print(f"Ingestion transaction for Branch package completed.")
 
@@ -309,18 +688,15 @@ def ingest_branch_package(package: ExtractionPackage[BranchData]):
 # ==============================================================================
 def create_inferred_relationships():
     """Creates inferred relationships ONLY between active nodes."""
-    driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-    with driver.session() as session:
+    with _driver.session(database=config.NEO4J_DATABASE) as session:
         print("\n" + "="*50 + "\nPHASE 2: CREATE INFERRED RELATIONSHIPS\n" + "="*50)
         
         print("Deleting all old :ADVISES_ON relationships...")
         session.run("MATCH ()-[r:ADVISES_ON]->() DETACH DELETE r")
 
         cypher_query = """
-        MATCH (m:Employee)-[r_m:FROM_SOURCE]->() WHERE r_m.is_active = true
-        MATCH (m)-[:HAS_ROLE_TYPE]->(:RoleType {name: 'Advisor'})
-        MATCH (p:Product)-[r_p:FROM_SOURCE]->() WHERE r_p.is_active = true
-        MATCH (p)-[:HAS_PRODUCT_TYPE]->(:ProductType {name: 'InterestProduct'})
+        MATCH (m:Employee {is_active: true})-[:HAS_ROLE_TYPE]->(:RoleType {name: 'Advisor'})
+        MATCH (p:Product {is_active: true})-[:HAS_PRODUCT_TYPE]->(:ProductType {name: 'InterestProduct'})
         MERGE (m)-[r:ADVISES_ON]->(p)
         RETURN count(r) AS new_relationship_count
         """
@@ -330,18 +706,59 @@ def create_inferred_relationships():
         summary = result.single()
         if summary:
             print(f"--> {summary['new_relationship_count']} new :ADVISES_ON relationships created.")
-    driver.close()
 
 # ==============================================================================
 # HELPERS
 # ==============================================================================
+# Uniqueness constraints on every MERGE key; without these each MERGE
+# degrades to a label scan and ingestion slows down as the graph grows.
+SCHEMA_CONSTRAINTS = [
+    "CREATE CONSTRAINT product_name IF NOT EXISTS FOR (p:Product) REQUIRE p.name IS UNIQUE",
+    "CREATE CONSTRAINT condition_key IF NOT EXISTS FOR (c:Condition) REQUIRE c.key IS UNIQUE",
+    "CREATE CONSTRAINT faq_question IF NOT EXISTS FOR (f:FAQ) REQUIRE f.question IS UNIQUE",
+    "CREATE CONSTRAINT branch_name IF NOT EXISTS FOR (b:Branch) REQUIRE b.name IS UNIQUE",
+    "CREATE CONSTRAINT employee_name IF NOT EXISTS FOR (e:Employee) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT source_url IF NOT EXISTS FOR (s:Source) REQUIRE s.url IS UNIQUE",
+    "CREATE CONSTRAINT roletype_name IF NOT EXISTS FOR (r:RoleType) REQUIRE r.name IS UNIQUE",
+    "CREATE CONSTRAINT producttype_name IF NOT EXISTS FOR (t:ProductType) REQUIRE t.name IS UNIQUE",
+    "CREATE CONSTRAINT riskclass IF NOT EXISTS FOR (r:RiskClass) REQUIRE r.risk_class IS UNIQUE",
+    # Range indexes for the read-side lookups in query.py: conditions are
+    # filtered by term and amount bounds, which the uniqueness constraints
+    # above do not cover.
+    "CREATE INDEX condition_term_years IF NOT EXISTS FOR (c:Condition) ON (c.term_years)",
+    "CREATE INDEX condition_lookup IF NOT EXISTS FOR (c:Condition) ON (c.term_years, c.min_amount, c.max_amount)",
+    # Indexes on the denormalized node-level is_active flag, so the read
+    # queries can skip the FROM_SOURCE hop entirely.
+    "CREATE INDEX product_active IF NOT EXISTS FOR (p:Product) ON (p.is_active)",
+    "CREATE INDEX condition_active IF NOT EXISTS FOR (c:Condition) ON (c.is_active)",
+    "CREATE INDEX faq_active IF NOT EXISTS FOR (f:FAQ) ON (f.is_active)",
+    "CREATE INDEX branch_active IF NOT EXISTS FOR (b:Branch) ON (b.is_active)",
+    "CREATE INDEX employee_active IF NOT EXISTS FOR (e:Employee) ON (e.is_active)",
+    # TEXT indexes: range indexes cannot serve CONTAINS, which the debug
+    # queries use on Branch.name and Source.url.
+    "CREATE TEXT INDEX branch_name_text IF NOT EXISTS FOR (b:Branch) ON (b.name)",
+    "CREATE TEXT INDEX source_url_text IF NOT EXISTS FOR (s:Source) ON (s.url)",
+    # Relationship property indexes: the inference query and the
+    # Corroborator both filter FROM_SOURCE on these properties.
+    "CREATE INDEX rel_active IF NOT EXISTS FOR ()-[r:FROM_SOURCE]-() ON (r.is_active)",
+    "CREATE INDEX rel_retrieved IF NOT EXISTS FOR ()-[r:FROM_SOURCE]-() ON (r.retrieved_at)",
+]
+
+def ensure_schema():
+    """Creates the uniqueness constraints backing all MERGE keys (idempotent)."""
+    print("Ensuring schema constraints exist...")
+    with _driver.session(database=config.NEO4J_DATABASE) as s:
+        for statement in SCHEMA_CONSTRAINTS:
+            s.run(statement)
+    print("Schema constraints ensured.")
+
 def clear_database():
-    """Empties the entire Neo4j database."""
+    """Empties the entire Neo4j database and (re-)creates the schema."""
     print("Clearing the Neo4j database before starting...")
-    driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-    with driver.session() as s:
+    with _driver.session(database=config.NEO4J_DATABASE) as s:
         s.run("MATCH (n) DETACH DELETE n")
     print("Database cleared.")
+    ensure_schema()
 
 def ingest_fake_data():
     """
@@ -357,7 +774,7 @@ def ingest_fake_data():
     
     # 2. Create Pydantic Models
     try:
-        fake_time = datetime.fromisoformat(fake_time_str)
+        fake_time = int(datetime.fromisoformat(fake_time_str).timestamp() * 1000)
         fake_trust = config.get_trust_score(fake_url)
         
         fake_meta = ProvenanceModel(
@@ -375,19 +792,19 @@ def ingest_fake_data():
         )
         
         # 3. Get Node/Rel Properties
-        node_props = get_node_props(fake_condition)
+        node_props, rel_props = get_props(fake_condition)
         node_props['key'] = fake_key
-        rel_props = get_rel_props(fake_condition)
 
         # 4. Open a DB session and call the Corroborator directly
-        driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-        with driver.session() as session:
+        with _driver.session(database=config.NEO4J_DATABASE) as session:
             
             # Deactivate old facts from this FAKE source first
             # KORREKTUR: {{is_active: true}} -> {is_active: true}
             session.run("""
                 MATCH (n:Condition)-[r:FROM_SOURCE {is_active: true}]->(q:Source {url: $url})
                 SET r.is_active = false
+                WITH DISTINCT n
+                SET n.is_active = EXISTS { (n)-[:FROM_SOURCE {is_active: true}]->() }
             """, url=fake_url)
             
             # Call the Corroborator transaction
@@ -1,164 +1,264 @@
-from neo4j import GraphDatabase
+import asyncio
+
+from neo4j import AsyncGraphDatabase
 import config
 
-def query_graph():
-    """Runs comprehensive test queries against the graph to validate the entire data structure."""
-    driver = GraphDatabase.driver(config.NEO4J_URI, auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD))
-    
-    with driver.session() as session:
+# --- Query texts ---
+# Module-level constants: built once at import time, and byte-identical on
+# every run, so both the driver's client-side query cache and the server's
+# plan cache key on the same string across repeated query_graph() calls.
+
+_QUERY1 = """
+MATCH (p:Product {is_active: true})
+MATCH (pt:ProductType)<-[:HAS_PRODUCT_TYPE]-(p)-[:HAS_RISK_CLASS]->(s:RiskClass)
+RETURN p.name AS Product, pt.name AS Type, s.risk_class AS Risk
+ORDER BY Risk, Type, Product
+"""
+
+# Queries 2 and 3 both fan out from active employees, so they share one
+# driving match and run as a tagged UNION in a single round-trip; rows are
+# dispatched on `tag` and grouped/sorted client-side.
+_QUERY23 = """
+MATCH (m:Employee {is_active: true})
+CALL {
+    WITH m
+    MATCH (m)-[:WORKS_IN]->(f:Branch {is_active: true})
+    RETURN 'Q2' AS tag, f.name AS branch, m.name AS employee, NULL AS product
+  UNION ALL
+    WITH m
+    MATCH (m)-[:ADVISES_ON]->(p:Product {is_active: true})
+    RETURN 'Q3' AS tag, NULL AS branch, m.name AS employee, p.name AS product
+}
+RETURN tag, branch, employee, product
+"""
+
+_QUERY4 = """
+MATCH (k:Condition {is_active: true})
+USING INDEX k:Condition(term_years)
+WHERE k.term_years = $years AND k.min_amount <= $amount AND (k.max_amount IS NULL OR k.max_amount >= $amount)
+MATCH (p:Product {is_active: true})-[:HAS_CONDITION]->(k)
+WITH DISTINCT p
+MATCH (p)-[:HAS_RISK_CLASS]->(s:RiskClass)
+WHERE s.risk_class IN $risk_classes
+MATCH (m:Employee {is_active: true})-[:ADVISES_ON]->(p)
+MATCH (m)-[:WORKS_IN]->(f:Branch)
+WHERE f.name CONTAINS $branch
+RETURN DISTINCT m.name AS ContactPerson, m.email AS Email
+"""
+
+# Plain CALL subqueries instead of the Cypher 25 preview LET/COLLECT
+# syntax, so the query runs on any 5.x server. The LIMITs bound what the
+# server materializes and ships: only the first employee row is rendered,
+# and the collected lists are capped well above any plausible real size.
+_QUERY5 = """
+MATCH (m:Employee {name: $name})
+CALL {
+    WITH m
+    MATCH (m)-[:WORKS_IN]->(f:Branch {is_active: true})
+    WITH f.name AS name LIMIT 100
+    RETURN collect(name) AS branches
+}
+CALL {
+    WITH m
+    MATCH (m)-[:ADVISES_ON]->(p:Product {is_active: true})
+    MATCH (p)-[:HAS_RISK_CLASS]->(s:RiskClass {risk_class: $risk_class})
+    WITH p.name AS name LIMIT 100
+    RETURN collect(name) AS advised_products_sk1
+}
+RETURN m.name AS Employee, m.email AS Email, m.phone AS Phone, branches, advised_products_sk1
+LIMIT 1
+"""
+
+# The three provenance debug queries (6, 7, 8) share the
+# (n)-[:FROM_SOURCE]->(:Source) shape, so they run as one tagged UNION
+# in a single round-trip; the rows are dispatched on `tag` client-side.
+# Every branch projects down to scalars immediately - no node or
+# relationship objects cross the wire, and only the first label is
+# shipped since that is all the rendering uses.
+_QUERY678 = """
+CALL {
+    MATCH (f:Branch)-[r:FROM_SOURCE]->(q:Source)
+    WHERE f.name CONTAINS $branch
+    RETURN 'Q6' AS tag, NULL AS label, f.name AS value, NULL AS evidence, q.url AS source, r.retrieved_at AS ts, r.is_active AS active
+  UNION ALL
+    MATCH (n)-[r:FROM_SOURCE]->(q:Source)
+    WHERE q.url CONTAINS $source_fragment
+    RETURN 'Q7' AS tag, labels(n)[0] AS label, COALESCE(n.name, n.key, n.question) AS value, NULL AS evidence, q.url AS source, r.retrieved_at AS ts, r.is_active AS active
+  UNION ALL
+    MATCH (f:Branch)-[r:FROM_SOURCE]->(q:Source)
+    WHERE f.name CONTAINS $branch AND r.name_evidence IS NOT NULL
+    WITH f, r, q ORDER BY r.retrieved_at DESC LIMIT 1
+    RETURN 'Q8' AS tag, NULL AS label, f.name AS value, r.name_evidence AS evidence, q.url AS source, r.retrieved_at AS ts, r.is_active AS active
+}
+RETURN tag, label, value, evidence, source, ts, active
+"""
+
+_QUERY9 = """
+MATCH (k:Condition {is_active: true})
+USING INDEX k:Condition(term_years)
+WHERE k.term_years = $years
+AND k.min_amount <= $amount
+AND (k.max_amount IS NULL OR k.max_amount >= $amount)
+MATCH (p:Product)-[:HAS_CONDITION]->(k)
+RETURN p.name AS Product, k.interest_rate AS InterestRate, k.type AS ConditionType
+"""
+
+async def query_graph_async():
+    """Runs comprehensive test queries against the graph to validate the entire data structure.
+
+    The nine queries are independent, so they run concurrently on separate
+    sessions (sessions are not thread/task-safe, one per task) and the
+    results are printed in order once all of them are in. Wall time is
+    roughly the slowest query instead of the sum.
+    """
+    # The driver's connection pool is bound to the running event loop, and
+    # query_graph() starts a fresh loop per call - so the driver is created
+    # and closed per run instead of being cached in a module global, whose
+    # pooled sockets would be tied to an already-closed loop on reuse.
+    driver = AsyncGraphDatabase.driver(
+        config.NEO4J_URI,
+        auth=(config.NEO4J_USERNAME, config.NEO4J_PASSWORD),
+        max_connection_pool_size=50,
+    )
+    try:
+        async def run_queries(*jobs):
+            # execute_read gives us managed transactions: the driver retries
+            # transparently on transient errors and leader switches. Several
+            # queries share one transaction, so the Bolt BEGIN/COMMIT round
+            # trips are paid once per group instead of once per query.
+            async def work(tx):
+                results = []
+                for query, params in jobs:
+                    # Consume the cursor as rows arrive instead of fetching all
+                    # at once; fetch_size keeps the server streaming in bounded
+                    # batches.
+                    result = await tx.run(query, **params)
+                    results.append([record async for record in result])
+                return results
+
+            async with driver.session(database=config.NEO4J_DATABASE, fetch_size=1000) as session:
+                return await session.execute_read(work)
+
+        async def run_query(query, **params):
+            (records,) = await run_queries((query, params))
+            return records
+
         print("\n" + "="*50 + "\nRUNNING GRAPH QUERIES\n" + "="*50)
 
+        branch_substring = "Bispingen"
+        source_fragment = "sparbrief.html"
+        investment_amount = 60000
+        investment_years = 5
+        risk_classes = ['1', '2']
+        employee_name = "Martin Zado"
+        q9_amount = 30000
+        q9_years = 5
+
+        # Queries 1-3 are quick overview scans, so they ride in one shared
+        # transaction; the heavier 4/5/678/9 keep their own so they can overlap.
+        (records123, records4, records5,
+         records678, records9) = await asyncio.gather(
+            run_queries((_QUERY1, {}), (_QUERY23, {})),
+            run_query(_QUERY4, amount=investment_amount, years=investment_years,
+                      risk_classes=risk_classes, branch=branch_substring),
+            run_query(_QUERY5, name=employee_name, risk_class='1'),
+            run_query(_QUERY678, branch=branch_substring, source_fragment=source_fragment),
+            run_query(_QUERY9, amount=q9_amount, years=q9_years),
+            return_exceptions=True,
+        )
+
+        if isinstance(records123, Exception):
+            records1, records2, records3 = [], [], []
+            print(f"ERROR during queries 1-3: {records123}")
+        else:
+            records1, records23 = records123
+            by_branch = {}
+            for r in (row for row in records23 if row['tag'] == 'Q2'):
+                by_branch.setdefault(r['branch'], set()).add(r['employee'])
+            records2 = [{'Branch': branch, 'Employees': sorted(employees)}
+                        for branch, employees in sorted(by_branch.items())]
+            records3 = [{'Advisor': advisor, 'Product': product}
+                        for advisor, product in sorted({(r['employee'], r['product'])
+                                                        for r in records23 if r['tag'] == 'Q3'})]
+
+        if isinstance(records4, Exception):
+            print(f"ERROR during Query 4: {records4}")
+            records4 = []
+
+        if isinstance(records9, Exception):
+            print(f"ERROR during Query 9: {records9}")
+            records9 = []
+
+        if isinstance(records678, Exception):
+            records6, records7, record8 = [], [], None
+            print(f"ERROR during debug queries 6-8: {records678}")
+        else:
+            records6 = sorted((r for r in records678 if r['tag'] == 'Q6'), key=lambda r: r['ts'], reverse=True)
+            records7 = sorted((r for r in records678 if r['tag'] == 'Q7'), key=lambda r: (-r['ts'], r['label'], str(r['value'])))
+            record8 = next((r for r in records678 if r['tag'] == 'Q8'), None)
+
         # --- Query 1 ---
         print("\n--- Query 1: Overview of all *active* products with type and risk class ---")
-        query1 = """
-        MATCH (p:Product)-[r_p:FROM_SOURCE]->() WHERE r_p.is_active = true
-        MATCH (pt:ProductType)<-[:HAS_PRODUCT_TYPE]-(p)-[:HAS_RISK_CLASS]->(s:RiskClass)
-        RETURN p.name AS Product, pt.name AS Type, s.risk_class AS Risk
-        ORDER BY Risk, Type, Product
-        """
-        result1 = session.run(query1)
-        for record in result1: print(f"- {record['Product']} (Type: {record['Type']}, Risk: {record['Risk']})")
+        for record in records1: print(f"- {record['Product']} (Type: {record['Type']}, Risk: {record['Risk']})")
 
         # --- Query 2 ---
         print("\n--- Query 2: Which *active* employees work in which *active* branch? ---")
-        query2 = """
-        MATCH (m:Employee)-[r_m:FROM_SOURCE]->() WHERE r_m.is_active = true
-        MATCH (f:Branch)-[r_f:FROM_SOURCE]->() WHERE r_f.is_active = true
-        MATCH (m)-[:WORKS_IN]->(f)
-        RETURN f.name AS Branch, collect(DISTINCT m.name) AS Employees
-        ORDER BY Branch
-        """
-        result2 = session.run(query2)
         print("(This query now filters out 'stale' employees)")
-        for record in result2:
+        for record in records2:
             print(f"Branch '{record['Branch']}':")
             for employee in record['Employees']: print(f"  - {employee}")
 
         # --- Query 3 ---
         print("\n--- Query 3: Which *active* advisors can advise on *active* interest products? ---")
-        query3 = """
-        MATCH (m:Employee)-[r_m:FROM_SOURCE]->() WHERE r_m.is_active = true
-        MATCH (p:Product)-[r_p:FROM_SOURCE]->() WHERE r_p.is_active = true
-        MATCH (m)-[:ADVISES_ON]->(p) 
-        RETURN m.name AS Advisor, p.name AS Product
-        ORDER BY Advisor, Product
-        """
-        result3 = session.run(query3)
-        for record in result3: print(f"- {record['Advisor']} can advise on '{record['Product']}'")
+        for record in records3: print(f"- {record['Advisor']} can advise on '{record['Product']}'")
 
         # --- Query 4 ---
         print("\n--- Query 4: Who in Bispingen can *currently* help me with a secure 5-year investment? ---")
-        query4 = """
-        MATCH (p:Product)-[r_p:FROM_SOURCE]->() WHERE r_p.is_active = true
-        MATCH (k:Condition)-[r_k:FROM_SOURCE]->() WHERE r_k.is_active = true
-        MATCH (p)-[:HAS_CONDITION]->(k) 
-        WHERE k.min_amount <= 60000 AND (k.max_amount IS NULL OR k.max_amount >= 60000) AND k.term_years = 5
-        WITH p
-        MATCH (p)-[:HAS_RISK_CLASS]->(s:RiskClass) 
-        WHERE s.risk_class IN ['1', '2']
-        MATCH (m:Employee)-[r_m:FROM_SOURCE]->() WHERE r_m.is_active = true
-        MATCH (m)-[:ADVISES_ON]->(p) 
-        MATCH (m)-[:WORKS_IN]->(f:Branch)
-        WHERE f.name CONTAINS 'Bispingen'
-        RETURN DISTINCT m.name AS ContactPerson, m.email AS Email
-        """
-        result4 = session.run(query4)
         print("Possible *active* contact persons in the Bispingen branch:")
-        for record in result4: print(f"- {record['ContactPerson']} (Email: {record['Email']})")
+        for record in records4: print(f"- {record['ContactPerson']} (Email: {record['Email']})")
 
         # --- Query 5 ---
         print("\n--- Query 5: In which *active* branches does Martin Zado work...? ---")
-        employee_name = "Martin Zado"
-        query5 = """
-        CYPHER 25
-        MATCH (m:Employee {name: $name})
-        LET branches = COLLECT {
-            MATCH (m)-[:WORKS_IN]->(f:Branch)
-            MATCH (f)-[r_f:FROM_SOURCE]->() WHERE r_f.is_active = true
-            RETURN f.name
-        }
-        LET advised_products_sk1 = COLLECT {
-            MATCH (m)-[:ADVISES_ON]->(p:Product) 
-            MATCH (p)-[r_p:FROM_SOURCE]->() WHERE r_p.is_active = true
-            MATCH (p)-[:HAS_RISK_CLASS]->(s:RiskClass {risk_class: '1'})
-            RETURN p.name
-        }
-        RETURN m.name AS Employee, m.email AS Email, m.phone AS Phone, branches, advised_products_sk1
-        """
-        try:
-            result5 = session.run(query5, name=employee_name)
-            record5 = result5.single() 
-            if not record5: print(f"Employee '{employee_name}' not found.")
-            else:
-                print(f"Details for: {record5['Employee']}")
-                print(f"  - Email: {record5['Email']}, Phone: {record5['Phone']}")
-                print(f"  - Works in *active* branches: {record5['branches']}")
-                print(f"  - Advises on *active* products (SK1): {record5['advised_products_sk1']}")
-        except Exception as e: print(f"ERROR during Query 5: {e}")
+        if isinstance(records5, Exception): print(f"ERROR during Query 5: {records5}")
+        elif not records5: print(f"Employee '{employee_name}' not found.")
+        else:
+            record5 = records5[0]
+            print(f"Details for: {record5['Employee']}")
+            print(f"  - Email: {record5['Email']}, Phone: {record5['Phone']}")
+            print(f"  - Works in *active* branches: {record5['branches']}")
+            print(f"  - Advises on *active* products (SK1): {record5['advised_products_sk1']}")
 
         # --- Query 6 ---
         print("\n--- Query 6 (Debug): Where does the 'Bispingen Branch' fact come from (all versions)? ---")
-        query6 = """
-        MATCH (f:Branch)-[r:FROM_SOURCE]->(q:Source)
-        WHERE f.name CONTAINS 'Bispingen'
-        RETURN f.name AS Fact, q.url AS Source, r.retrieved_at AS Timestamp, r.is_active AS Active
-        ORDER BY r.retrieved_at DESC
-        """
-        result6 = session.run(query6)
-        for record in result6: print(f"- Fact: '{record['Fact']}' @ {record['Timestamp']} (Source: {record['Source']}) [Active: {record['Active']}]")
-        
+        for record in records6: print(f"- Fact: '{record['value']}' @ {record['ts']} (Source: {record['source']}) [Active: {record['active']}]")
+
         # --- Query 7 ---
         print("\n--- Query 7 (Debug): What facts were *ever* extracted from the savings bond page? ---")
-        query7 = """
-        MATCH (n)-[r:FROM_SOURCE]->(q:Source)
-        WHERE q.url CONTAINS 'sparbrief.html'
-        RETURN labels(n) AS Type, COALESCE(n.name, n.key, n.question) AS NameOrKey, r.retrieved_at AS Timestamp, r.is_active AS Active
-        ORDER BY Timestamp DESC, Type, NameOrKey
-        """
-        result7 = session.run(query7)
         print(f"Facts from savings bond page (newest first):")
-        for record in result7: print(f"- [{record['Type'][0]}] {record['NameOrKey']} (Retrieved: {record['Timestamp']}) [Active: {record['Active']}]")
-        
+        for record in records7: print(f"- [{record['label']}] {record['value']} (Retrieved: {record['ts']}) [Active: {record['active']}]")
+
         # --- Query 8 ---
         print("\n--- Query 8 (Debug): What is the *evidence* for a branch named Bispingen? ---")
-        query8 = """
-        MATCH (f:Branch)-[r:FROM_SOURCE]->(q:Source)
-        WHERE f.name CONTAINS 'Bispingen' AND r.name_evidence IS NOT NULL
-        RETURN f.name AS FactValue, r.name_evidence AS FactEvidence, q.url AS Source, r.retrieved_at AS Timestamp, r.is_active AS Active
-        ORDER BY r.retrieved_at DESC
-        LIMIT 1
-        """
-        result8 = session.run(query8)
-        record8 = result8.single()
-        if record8: print(f"- Fact (found): '{record8['FactValue']}' (Newest from {record8['Timestamp']}) [Active: {record8['Active']}]\n  Evidence: '{record8['FactEvidence']}'")
+        if record8:
+            print(f"- Fact (found): '{record8['value']}' (Newest from {record8['ts']}) [Active: {record8['active']}]\n  Evidence: '{record8['evidence']}'")
         else: print("No evidence found for a branch named 'Bispingen'.")
 
         # --- Query 9 ---
         print("\n--- Query 9: 'How much interest for 30,000€ for 5 years?' ---")
-        investment_amount = 30000
-        investment_years = 5
-        query9 = """
-        MATCH (p:Product)-[:HAS_CONDITION]->(k:Condition)
-        MATCH (k)-[r_k:FROM_SOURCE]->()
-        WHERE r_k.is_active = true 
-        
-        AND k.min_amount <= $amount 
-        AND (k.max_amount IS NULL OR k.max_amount >= $amount) 
-        AND k.term_years = $years
-        
-        RETURN p.name AS Product, k.interest_rate AS InterestRate, k.type AS ConditionType
-        """
-        result9 = session.run(query9, amount=investment_amount, years=investment_years)
-        print(f"Results for an *active* investment of {investment_amount}€ over {investment_years} years:")
-        records9 = list(result9)
-        if not records9: print("  -> No matching *active* conditions found.")
-        else:
-            for record in records9: print(f"  - Product: '{record['Product']}', Interest Rate: {record['InterestRate']} (Type: {record['ConditionType']})")
+        print(f"Results for an *active* investment of {q9_amount}€ over {q9_years} years:")
+        found9 = False
+        for record in records9:
+            found9 = True
+            print(f"  - Product: '{record['Product']}', Interest Rate: {record['InterestRate']} (Type: {record['ConditionType']})")
+        if not found9: print("  -> No matching *active* conditions found.")
+
+    finally:
+        await driver.close()
 
-    driver.close()
+def query_graph():
+    """Synchronous wrapper that drives the concurrent query run."""
+    asyncio.run(query_graph_async())
 
 # allow the file to be run as a script
 if __name__ == "__main__":
     query_graph()
-    
-    